@@ -2,6 +2,7 @@
 from __future__ import annotations
 import os
 from typing import List, Dict, Optional
+import numpy as np
 import pandas as pd
 
 
@@ -10,32 +11,32 @@ import pandas as pd
 class BOMWriter:
     """
     Standalone Excel BOM writer that mirrors your sample's layout/formatting.
-    - Uses pandas + xlsxwriter only (no DB).
+    - Uses pandas + xlsxwriter only (no DB); PyExcelerate, when installed, handles
+      the plain no-logo case in bulk.
     - Builds formula columns (Extended, Your Price, Our Cost, Margin) per row.
     - Adds a totals footer row with the same formulas you showed.
-    - Applies the same fonts, widths, header styling, conditional left column,
+    - Applies the same fonts, widths, header styling, left column banding,
       freeze panes, and optional logo insertion.
     """
 
     def __init__(self, font_name: str = "Futura Medium"):
         self.font_name = font_name
 
-    # ----- Helpers that mirror your original formulas (rownum is 1-based in Excel) -----
-    def _f_extended(self, rownum: int) -> str:
-        # =((B{row}*G{row})*H{row})
-        return f"=((B{rownum}*G{rownum})*H{rownum})"
+    # ----- Formula templates that mirror your original formulas ({r} is the 1-based Excel row) -----
+    _F_EXT = "=((B{r}*G{r})*H{r})"                 # Extended
+    _F_YP = "=(I{r}-(I{r}*J{r}))"                  # Your Price
+    _F_OC = "=(I{r}-(I{r}*L{r}))"                  # Our Cost
+    _F_MG = "=IFERROR(((K{r}-M{r})/K{r}),0)"       # Margin
 
-    def _f_your_price(self, rownum: int) -> str:
-        # =(I{row}-(I{row}*J{row}))
-        return f"=(I{rownum}-(I{rownum}*J{rownum}))"
+    def _fmt(self, workbook, **props):
+        # Every format shares the writer's font; callers pass only what differs
+        return workbook.add_format({"font_name": self.font_name, **props})
 
-    def _f_our_cost(self, rownum: int) -> str:
-        # =(I{row}-(I{row}*L{row}))
-        return f"=(I{rownum}-(I{rownum}*L{rownum}))"
-
-    def _f_margin(self, rownum: int) -> str:
-        # =IFERROR(((K{row}-M{row})/K{row}),0)
-        return f"=IFERROR(((K{rownum}-M{rownum})/K{rownum}),0)"
+    @staticmethod
+    def _cells(df: pd.DataFrame) -> pd.DataFrame:
+        # Cell values with NaN/NaT as None, so they are written as blank cells (what
+        # df.to_excel's na_rep="" did) instead of being rejected as NAN by the writer
+        return df.astype(object).where(df.notna(), None)
 
     # ---- Public API --------------------------------------------------------------------
     def build_dataframe(self, items: List[Dict]) -> pd.DataFrame:
@@ -44,39 +45,37 @@ class BOMWriter:
           qty, type, sku, pt_sku, description, price, term (months), sell_disc (% as 0-100), buy_disc (% as 0-100)
         Builds a DataFrame with the same columns as your sample (including formula columns).
         """
-        rows = []
-        # Excel row numbers start at 1; header is row 1; first data row is row 2
-        for idx, it in enumerate(items, start=2):
-            # Safe gets with defaults
-            qty = it.get("qty", 1)
-            prod_type = it.get("type", "")
-            sku = it.get("sku", "")
-            pt_sku = it.get("pt_sku", "")
-            desc = it.get("description", "")
-            price = it.get("price", 0.0)
-            term_years = (int(it.get("term", 12)) or 12) / 12  # months → years
-            sell_disc = float(it.get("sell_disc", 0.0)) / 100.0
-            buy_disc = float(it.get("buy_disc", 0.0)) / 100.0
-
-            row = {
-                " ": "",
-                "QTY": qty,
-                "Product Type": prod_type,
-                "SKU": sku,
-                "Partner SKU": pt_sku,
-                "Description": desc,
-                "Price": price,
-                "Term": term_years,
-                "Extended": self._f_extended(idx),
-                "Discount": sell_disc,
-                "Your Price": self._f_your_price(idx),
-                "Buy Discount": buy_disc,
-                "Our Cost": self._f_our_cost(idx),
-                "Margin": self._f_margin(idx),
-            }
-            rows.append(row)
-
-        df = pd.DataFrame(rows)
+        n = len(items)
+        # Excel row numbers start at 1; header is row 1; first data row is row 2.
+        # Stringified once and substituted with str.replace (no format mini-language).
+        excel_rows = [str(r) for r in range(2, 2 + n)]
+
+        # One pass per input column (safe gets with defaults)
+        qty = [it.get("qty", 1) for it in items]
+        price = [it.get("price", 0.0) for it in items]
+        term_years = np.fromiter(((int(it.get("term", 12)) or 12) for it in items),
+                                 dtype=np.float64, count=n) / 12  # months → years
+        sell_disc = np.fromiter((float(it.get("sell_disc", 0.0)) for it in items),
+                                dtype=np.float64, count=n) / 100.0
+        buy_disc = np.fromiter((float(it.get("buy_disc", 0.0)) for it in items),
+                               dtype=np.float64, count=n) / 100.0
+
+        df = pd.DataFrame({
+            " ": [""] * n,
+            "QTY": qty,
+            "Product Type": [it.get("type", "") for it in items],
+            "SKU": [it.get("sku", "") for it in items],
+            "Partner SKU": [it.get("pt_sku", "") for it in items],
+            "Description": [it.get("description", "") for it in items],
+            "Price": price,
+            "Term": term_years,
+            "Extended": [self._F_EXT.replace("{r}", r) for r in excel_rows],
+            "Discount": sell_disc,
+            "Your Price": [self._F_YP.replace("{r}", r) for r in excel_rows],
+            "Buy Discount": buy_disc,
+            "Our Cost": [self._F_OC.replace("{r}", r) for r in excel_rows],
+            "Margin": [self._F_MG.replace("{r}", r) for r in excel_rows],
+        })
         # Remove any "Unnamed: ..." columns if a caller passes a pre-built frame through
         df.drop(df.filter(regex="^Unname", axis=1), axis=1, errors="ignore", inplace=True)
         return df
@@ -95,78 +94,86 @@ class BOMWriter:
         - logo_path: optional path to an image (PNG/JPG) to place at top-left
         Returns the final output_path.
         """
+        # PyExcelerate has no image support, so only the logo case needs xlsxwriter
+        if not logo_path:
+            try:
+                return self.write_bom_fast(df, output_path, sheet_name)
+            except ImportError:
+                pass
+
         os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
 
         # Excel sheet name limit (31 chars)
         sname = sheet_name if len(sheet_name) <= 31 else f"{sheet_name[:29]}.."
 
-        with pd.ExcelWriter(output_path, engine="xlsxwriter") as writer:
-            df.to_excel(writer, index=False, sheet_name=sname, freeze_panes=(1, 0))
+        # constant_memory streams each row to disk as soon as the next one starts, so
+        # cells must be written strictly top-to-bottom (df.to_excel writes per column).
+        engine_kwargs = {"options": {
+            "constant_memory": True,
+            "strings_to_numbers": False,
+        }}
+        with pd.ExcelWriter(output_path, engine="xlsxwriter", engine_kwargs=engine_kwargs) as writer:
             workbook  = writer.book
-            worksheet = writer.sheets[sname]
+            worksheet = workbook.add_worksheet(sname)
+            worksheet.freeze_panes(1, 0)
 
             # ----- Formats (mirroring your sample) -----
-            text_format = workbook.add_format({"font_name": self.font_name, "text_wrap": False})
-            wrap_format = workbook.add_format({"font_name": self.font_name, "text_wrap": True})
-            money_format = workbook.add_format({"font_name": self.font_name, "num_format": "$#,##0.00", "align": "right"})
-            percent_format = workbook.add_format({"font_name": self.font_name, "num_format": "0%"})
-            qty_format = workbook.add_format({"font_name": self.font_name, "align": "Center"})
-
-            left_col_format = workbook.add_format({
-                "font_name": self.font_name, "bg_color": "#404040", "font_color": "#ffffff",
-                "bold": True, "align": "center", "border": 1,
-            })
-
-            header_format = workbook.add_format({
-                "font_name": self.font_name, "bold": True, "text_wrap": True, "valign": "center",
-                "align": "center", "fg_color": "#404040", "border": 1, "font_color": "#ffffff",
-            })
-
-            footer_money_format = workbook.add_format({
-                "font_name": self.font_name, "num_format": "$#,##0.00", "align": "right",
-                "fg_color": "#404040", "bold": True, "border": 1, "font_color": "#ffffff",
-            })
-
-            footer_percent_format = workbook.add_format({
-                "font_name": self.font_name, "num_format": "0%", "align": "right",
-                "fg_color": "#404040", "bold": True, "border": 1, "font_color": "#ffffff",
-            })
-
-            # ----- Column widths / formats (A:ZZ baseline then specifics) -----
-            worksheet.set_column("A:ZZ", 7, text_format)
-            worksheet.set_column("A:A", 7)                 # " "
-            worksheet.set_column("B:B", 6, qty_format)     # QTY
-            worksheet.set_column("C:C", 14)                # Product Type
-            worksheet.set_column("D:D", 30)                # SKU
-            worksheet.set_column("E:E", 30)                # Partner SKU
-            worksheet.set_column("F:F", 55, wrap_format)   # Description
-            worksheet.set_column("G:G", 18, money_format)  # Price (List Price)
-            worksheet.set_column("H:H", 7)                 # Term
-            worksheet.set_column("I:I", 20, money_format)  # Your Price deps; here Extended/Your Price share columns
-            worksheet.set_column("J:J", 10, percent_format)
-            worksheet.set_column("K:K", 20, money_format)
-            worksheet.set_column("L:L", 10, percent_format)
-            worksheet.set_column("M:M", 20, money_format)
-            worksheet.set_column("N:N", 8,  percent_format)
+            money = {"num_format": "$#,##0.00", "align": "right"}
+            dark_band = {"fg_color": "#404040", "bold": True, "border": 1, "font_color": "#ffffff"}
+
+            wrap_format = self._fmt(workbook, text_wrap=True)
+            money_format = self._fmt(workbook, **money)
+            percent_format = self._fmt(workbook, num_format="0%")
+            qty_format = self._fmt(workbook, align="Center")
+
+            left_col_format = self._fmt(workbook, bg_color="#404040", font_color="#ffffff",
+                                        bold=True, align="center", border=1)
+            header_format = self._fmt(workbook, **dark_band, text_wrap=True, valign="center", align="center")
+            footer_money_format = self._fmt(workbook, **money, **dark_band)
+            footer_percent_format = self._fmt(workbook, num_format="0%", align="right", **dark_band)
+
+            # ----- Column widths / formats (only the 14 BOM columns, A:N) -----
+            col_specs = [
+                (0, 0, 7, None),               # " "
+                (1, 1, 6, qty_format),         # QTY
+                (2, 2, 14, None),              # Product Type
+                (3, 3, 30, None),              # SKU
+                (4, 4, 30, None),              # Partner SKU
+                (5, 5, 55, wrap_format),       # Description
+                (6, 6, 18, money_format),      # Price (List Price)
+                (7, 7, 7, None),               # Term
+                (8, 8, 20, money_format),      # Your Price deps; here Extended/Your Price share columns
+                (9, 9, 10, percent_format),
+                (10, 10, 20, money_format),
+                (11, 11, 10, percent_format),
+                (12, 12, 20, money_format),
+                (13, 13, 8, percent_format),
+            ]
+            for first_col, last_col, width, fmt in col_specs:
+                worksheet.set_column(first_col, last_col, width, fmt)
 
             # Header row tweaks + optional logo
             worksheet.set_row(0, 100)
             if logo_path and os.path.exists(logo_path):
                 worksheet.insert_image(0, 0, logo_path, {"x_scale": 0.3, "y_scale": 0.3, "x_offset": 10, "y_offset": 10})
 
-            # Rewrite header row with formatting and rename "Price" → "List Price"
+            # Header row with formatting and rename "Price" → "List Price"
             columns = list(df.columns)
             for col_idx, val in enumerate(columns):
                 display_val = "List Price" if val == "Price" else val
                 worksheet.write(0, col_idx, display_val, header_format)
 
-            # Left-most banding (conditional on not blank)
-            # Compute last data row index (0-based) and Excel row numbers
-            # dim_rowmax is the highest row index that contains data (0-based)
-            last_data_row_0based = worksheet.dim_rowmax  # includes header row
-            # Apply conditional format from row 2 (index 1) through the last data row.
-            worksheet.conditional_format(1, 0, last_data_row_0based, 0,
-                                         {"type": "no_blanks", "format": left_col_format})
+            # Data rows, strictly in row order, one write_row per row. Unformatted cells
+            # pick up the column formats set above, and "=..." strings are written as
+            # formulas. The left-most column is banded directly on non-blank cells,
+            # which is what the old "no_blanks" conditional format showed.
+            for r, row in enumerate(self._cells(df).itertuples(index=False), start=1):
+                lead = row[0]
+                worksheet.write(r, 0, lead, left_col_format if lead not in ("", None) else None)
+                worksheet.write_row(r, 1, row[1:])
+
+            # Last data row index (0-based); the header is row 0
+            last_data_row_0based = len(df)
 
             # Footer (Totals) one row after the last data row
             last_row_excel = last_data_row_0based + 1  # Convert to 1-based Excel index
@@ -206,6 +213,109 @@ class BOMWriter:
             # (context manager closes the writer)
         return output_path
 
+    def write_bom_fast(
+        self,
+        df: pd.DataFrame,
+        output_path: str,
+        sheet_name: str = "BOM",
+    ) -> str:
+        """
+        Same layout as write_bom (minus the logo), written with PyExcelerate.
+        The whole sheet is handed over as one 2-D list and styles are pre-built
+        once per column instead of per cell. Blank data cells are left empty, as
+        in write_bom.
+        Raises ImportError if pyexcelerate is not installed.
+        Returns the final output_path.
+        """
+        from pyexcelerate import Workbook, Style, Font, Fill, Format, Alignment, Color, Panes
+        from pyexcelerate.Border import Border
+        from pyexcelerate.Borders import Borders
+
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+
+        # Excel sheet name limit (31 chars)
+        sname = sheet_name if len(sheet_name) <= 31 else f"{sheet_name[:29]}.."
+
+        columns = list(df.columns)
+        header = ["List Price" if c == "Price" else c for c in columns]
+        # NaN/NaT and "" become None, i.e. no cell at all (write_bom writes blanks the
+        # same way); PyExcelerate would otherwise write #NUM! or empty text cells
+        cells = self._cells(df)
+        cells = cells.where(cells.ne(""), None)
+        data = [header] + cells.values.tolist()
+
+        wb = Workbook()
+        ws = wb.new_sheet(sname, data=data)
+        ws.panes = Panes(y=1)
+
+        # ----- Styles (mirroring write_bom's formats) -----
+        dark, white = Color(0x40, 0x40, 0x40), Color(0xff, 0xff, 0xff)
+        border = Borders(Border(), Border(), Border(), Border())
+        font = Font(family=self.font_name)
+        bold_font = Font(family=self.font_name, bold=True, color=white)
+
+        general = Alignment(horizontal="general")
+        wrap_style = Style(font=font, alignment=Alignment(horizontal="general", wrap_text=True))
+        money_style = Style(font=font, format=Format("$#,##0.00"), alignment=Alignment(horizontal="right"))
+        percent_style = Style(font=font, format=Format("0%"), alignment=general)
+        qty_style = Style(font=font, alignment=Alignment(horizontal="center"))
+        left_col_style = Style(font=bold_font, fill=Fill(background=dark), borders=border,
+                               alignment=Alignment(horizontal="center"))
+        header_style = Style(font=bold_font, fill=Fill(background=dark), borders=border,
+                             alignment=Alignment(horizontal="center", vertical="center", wrap_text=True))
+        footer_money_style = Style(font=bold_font, fill=Fill(background=dark), borders=border,
+                                   format=Format("$#,##0.00"), alignment=Alignment(horizontal="right"))
+        footer_percent_style = Style(font=bold_font, fill=Fill(background=dark), borders=border,
+                                     format=Format("0%"), alignment=Alignment(horizontal="right"))
+
+        # ----- Column widths / formats (1-based columns) -----
+        col_specs = [
+            (7, None), (6, qty_style), (14, None), (30, None), (30, None),
+            (55, wrap_style), (18, money_style), (7, None), (20, money_style),
+            (10, percent_style), (20, money_style), (10, percent_style),
+            (20, money_style), (8, percent_style),
+        ]
+        for col, (width, style) in enumerate(col_specs, start=1):
+            # xlsxwriter pads set_column widths for cell margins; PyExcelerate writes them raw
+            width = int((int(width * 7 + 0.5) + 5) / 7 * 256) / 256
+            ws.set_col_style(col, Style(size=width, font=style.font, format=style.format,
+                                        alignment=style.alignment) if style else Style(size=width))
+
+        # Header row
+        ws.set_row_style(1, Style(size=100))
+        for col in range(1, len(header) + 1):
+            ws.set_cell_style(1, col, header_style)
+
+        # Left-most banding on non-blank cells (PyExcelerate has no conditional formats)
+        for r, val in enumerate(cells.iloc[:, 0].tolist() if len(columns) else [], start=2):
+            if val is not None:
+                ws.set_cell_style(r, 1, left_col_style)
+
+        # Footer (Totals) one row after the last data row
+        last_row_excel = len(df) + 1
+        t = last_row_excel + 1
+        # Totals line plus "" cells with header_style for the dark band on B:H
+        ws.set_cell_value(t, 1, "Totals")
+        ws.set_cell_style(t, 1, header_style)
+        for col in range(2, 9):
+            ws.set_cell_value(t, col, "")
+            ws.set_cell_style(t, col, header_style)
+
+        footer = [
+            (9,  f"=SUM(I2:I{last_row_excel})", footer_money_style),
+            (10, f"=SUM((I{t}-K{t})/I{t})",     footer_percent_style),
+            (11, f"=SUM(K2:K{last_row_excel})", footer_money_style),
+            (12, f"=SUM((I{t}-M{t})/I{t})",     footer_percent_style),
+            (13, f"=SUM(M2:M{last_row_excel})", footer_money_style),
+            (14, f"=SUM((K{t}-M{t})/K{t})",     footer_percent_style),
+        ]
+        for col, formula, style in footer:
+            ws.set_cell_value(t, col, formula)
+            ws.set_cell_style(t, col, style)
+
+        wb.save(output_path)
+        return output_path
+
 
 # -------------------- Example usage --------------------
 if __name__ == "__main__":
@@ -1,13 +1,19 @@
 # excel_to_quote_html.py
 from __future__ import annotations
 import argparse
-import base64
+import functools
 import json
+import math
 import re
 import os
+import subprocess
+import sys
+import warnings
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from datetime import datetime, timedelta
-from collections import OrderedDict  # ← ADDED
+from datetime import datetime, date, timedelta
+from numbers import Number, Real
 
 import numpy as np
 import pandas as pd
@@ -20,9 +26,11 @@ import utils.fire_a_quote_utils as utils
 # ------------------ Config ------------------
 
 LOGO_PATH = Path("utils/logo_small.jpg")
-with open(LOGO_PATH, "rb") as f:
-    logo_bytes = f.read()
-LOGO_B64 = base64.b64encode(logo_bytes).decode("utf-8")
+
+
+def get_logo_b64() -> str:
+    # Encoded lazily (the --usehtml path never needs it), once per process
+    return utils._logo_b64(LOGO_PATH)
 
 CANDIDATES = {
     "sku": ["sku", "part", "item", "product", "pn", "part number", "mpn", "partner sku"],
@@ -38,6 +46,8 @@ CANDIDATES = {
     "start_date": ["start date", "start", "service start", "begin", "term start"],
     "end_date": ["end date", "end", "service end", "finish", "term end"]
 }
+# Lowercased once; _pick compares against lowercased column names
+CANDIDATES_LC = {k: [c.lower() for c in v] for k, v in CANDIDATES.items()}
 
 
 DEFAULTS = clientAndAccountReps
@@ -50,16 +60,34 @@ def read_with_pandas_values(excel_path: Path, sheet: str) -> pd.DataFrame:
     return pd.read_excel(excel_path, sheet_name=sheet)
 
 
-def read_with_openpyxl_cached(excel_path: Path, sheet: str) -> pd.DataFrame:
+def open_workbook_cached(excel_path: Path):
+    # One read_only, cached-values workbook per run: sheet lookup and row reading share it.
+    # read_only streams rows instead of building the full cell DOM; callers must close() it.
+    return load_workbook(excel_path, data_only=True, read_only=True)
+
+
+def read_with_openpyxl_cached(wb, sheet: str) -> pd.DataFrame:
     # Explicitly read the *cached* (already-computed) values Excel stored last time it was saved.
-    wb = load_workbook(excel_path, data_only=True, read_only=False)
     ws = wb[sheet]
-    rows = list(ws.iter_rows(values_only=True))
-    if not rows:
+    # read_only trusts the sheet's <dimension> tag, which some writers get wrong
+    ws.reset_dimensions()
+    rows_iter = ws.iter_rows(values_only=True)
+    first = next(rows_iter, None)
+    if first is None:
         return pd.DataFrame()
-    headers = [str(h).strip() if h is not None else "" for h in rows[0]]
-    data = rows[1:]
-    return pd.DataFrame(data, columns=headers)
+    headers = [str(h).strip() if h is not None else "" for h in first]
+    return pd.DataFrame.from_records(rows_iter, columns=headers)
+
+
+def missing_cached_values(df: pd.DataFrame) -> bool:
+    # Workbooks written by libraries (or saved without a recalc) store formulas with no
+    # cached result, so data_only reads give None for the whole "Your Price" column.
+    # pandas reads the same cached values, so there is nothing to fall back to.
+    norm = utils._norm_cols(df).dropna(how="all")
+    if norm.empty:
+        return False
+    col_your = utils._pick(norm, CANDIDATES_LC["discount_price"])
+    return bool(col_your) and bool(norm[col_your].isna().all())
 
 
 def try_excel_recalc(excel_path: Path):
@@ -78,12 +106,38 @@ def try_excel_recalc(excel_path: Path):
 
 # ------------------ Items parsing ------------------
 
+# One quote line. Tuples are lighter than per-row dicts and the template reads the
+# fields as attributes (row.pt_sku).
+QuoteItem = namedtuple("QuoteItem", [
+    "pt_sku", "qty", "description",
+    "list_price",   # kept to optionally display it via --show-list-price
+    "unit_price",   # explicit unit price for the template
+    "subtotal",     # Extended: always the line total (Your Price)
+    "notes", "category", "start_date", "end_date",
+])
+
+# A QuoteItem plus its money values formatted for display (see add_display_strings)
+QuoteRow = namedtuple("QuoteRow", QuoteItem._fields + (
+    "price_str", "list_price_str", "unit_price_str", "extended_str",
+))
+
+
+def _is_missing(v) -> bool:
+    # Scalar NaN/NaT/None check; builtins skip the pd.isna call overhead (NaN != NaN),
+    # anything else (np.datetime64("NaT"), pd.NA, numpy scalars) goes through pd.isna
+    if v is None or v is pd.NaT:
+        return True
+    if isinstance(v, float):
+        return v != v
+    if isinstance(v, (str, int)):
+        return False
+    try:
+        return bool(pd.isna(v))
+    except (TypeError, ValueError):  # array-likes: not a single missing value
+        return False
 
-def _fmt_date(v):
-    import pandas as pd
-    from datetime import datetime, date
-    from numbers import Number
 
+def _fmt_date(v):
     # Empty/null
     if v is None:
         return ""
@@ -122,96 +176,186 @@ def _fmt_date(v):
     return s
 
 
-def parse_items(df_raw: pd.DataFrame) -> list[dict]:
+def _fmt_dates(col: pd.Series) -> np.ndarray:
+    """
+    Column-wide _fmt_date. Datetimes, Excel serials and strings are each parsed
+    with one pd.to_datetime call; strings use format="mixed" so every cell is
+    parsed on its own, as _fmt_date does. Anything the batch rejects goes
+    through _fmt_date individually.
+    """
+    vals = col.to_numpy(dtype=object)
+    out = np.full(len(vals), "", dtype=object)
+
+    is_dt = np.array([isinstance(v, (datetime, date)) and v is not pd.NaT for v in vals], dtype=bool)
+    is_num = np.array([isinstance(v, Real) and not isinstance(v, (datetime, date)) and v == v
+                       for v in vals], dtype=bool)
+    is_str = np.array([isinstance(v, str) and bool(v.strip()) for v in vals], dtype=bool)
+    is_other = ~(is_dt | is_num | is_str) & np.array([not _is_missing(v) and not isinstance(v, str)
+                                                     for v in vals], dtype=bool)
+
+    def _batch(mask, parse):
+        if not mask.any():
+            return
+        with warnings.catch_warnings():
+            # Mixed string formats fall back to per-element parsing; that's expected here
+            warnings.simplefilter("ignore", UserWarning)
+            parsed = pd.DatetimeIndex(parse(vals[mask]))
+        formatted = np.asarray(parsed.strftime("%Y-%m-%d"), dtype=object)
+        idx = np.flatnonzero(mask)
+        rejected = parsed.isna()
+        out[idx[~rejected]] = formatted[~rejected]
+        for i in idx[rejected]:
+            out[i] = _fmt_date(vals[i])
+
+    _batch(is_dt, lambda v: pd.to_datetime(v, errors="coerce"))
+    # Excel serial date: days since 1899-12-30
+    _batch(is_num, lambda v: pd.to_datetime(v.astype(float), unit="D", origin="1899-12-30", errors="coerce"))
+    _batch(is_str, lambda v: pd.to_datetime([x.strip() for x in v], errors="coerce",
+                                                         dayfirst=False, format="mixed"))
+    for i in np.flatnonzero(is_other):
+        out[i] = _fmt_date(vals[i])
+    return out
+
+
+def _make_item(sku, desc, qty, your_price_total, list_price, disc, note_v, cat_v, start_v, end_v) -> QuoteItem:
+    # One quote line from already-cleaned SKU/description/date strings, numbers from
+    # utils._num_series (NaN where blank/invalid) and raw notes/category cell values.
+    # Values of columns the sheet doesn't have arrive as None/NaN.
+
+    # QTY (default 1 if blank/invalid)
+    qty = int(qty) if qty > 0 else 1
+
+    # Primary path: "Your Price" is the LINE TOTAL
+    if math.isnan(list_price):
+        list_price = None
+
+    if not math.isnan(your_price_total):
+        # Unit Price = Your Price / QTY ; Extended = Your Price
+        unit_price = (your_price_total / qty) if qty else your_price_total
+        extended = your_price_total
+    elif list_price is not None:
+        # Fallback path (if "Your Price" missing): use list & discount or list itself
+        unit_price = list_price * (1 - (0 if math.isnan(disc) else disc))
+        extended = unit_price * qty
+    else:
+        unit_price = 0.0
+        extended = 0.0
+
+    return QuoteItem(
+        sku,
+        qty,
+        desc,
+        float(list_price) if list_price is not None else None,
+        float(unit_price),
+        float(extended),
+        "" if _is_missing(note_v) else str(note_v).strip(),
+        "" if _is_missing(cat_v) else str(cat_v).strip(),
+        start_v,
+        end_v,
+    )
+
+
+def parse_items(df_raw: pd.DataFrame) -> list[QuoteItem]:
     df = utils._norm_cols(df_raw).dropna(how="all")
     if df.empty:
         return []
 
     # Column picks (keeps your flexible header matching)
-    col_sku = utils._pick(df, [c.lower() for c in CANDIDATES["sku"]])
-    col_qty = utils._pick(df, [c.lower() for c in CANDIDATES["qty"]])
-    col_desc = utils._pick(df, [c.lower() for c in CANDIDATES["description"]])
+    col_sku = utils._pick(df, CANDIDATES_LC["sku"])
+    col_qty = utils._pick(df, CANDIDATES_LC["qty"])
+    col_desc = utils._pick(df, CANDIDATES_LC["description"])
 
     # Treat "Your Price" (discount_price family) as the LINE TOTAL if present.
-    col_your = utils._pick(df, [c.lower()
-                           for c in CANDIDATES["discount_price"]])
-    col_list = utils._pick(df, [c.lower() for c in CANDIDATES["unit_price"]])
-    col_disc = utils._pick(df, [c.lower() for c in CANDIDATES["discount"]])
+    col_your = utils._pick(df, CANDIDATES_LC["discount_price"])
+    col_list = utils._pick(df, CANDIDATES_LC["unit_price"])
+    col_disc = utils._pick(df, CANDIDATES_LC["discount"])
 
     # Start Date and End
-    col_start = utils._pick(df, [c.lower() for c in CANDIDATES["start_date"]])
-    col_end = utils._pick(df, [c.lower() for c in CANDIDATES["end_date"]])
+    col_start = utils._pick(df, CANDIDATES_LC["start_date"])
+    col_end = utils._pick(df, CANDIDATES_LC["end_date"])
 
     # Ignore any provided "Extended" column on purpose.
-    col_note = utils._pick(df, [c.lower() for c in CANDIDATES["notes"]])
-    col_cat = utils._pick(df, [c.lower() for c in CANDIDATES["category"]])
-
-    items: list[dict] = []
-    for _, r in df.iterrows():
-        sku = (str(r.get(col_sku)) if col_sku else "").strip()
-        desc = (str(r.get(col_desc)) if col_desc else "").strip()
-        if (not sku or sku.lower() == "nan") and (not desc or desc.lower() == "nan"):
-            continue
-
-        # Skip "Totals" rows
-        first_col_name = df.columns[0]
-        first_val = r.get(first_col_name)
-        if isinstance(first_val, str) and first_val.strip().lower() == "totals":
-            continue
-
-        # QTY (default 1 if blank/invalid)
-        qty = utils._num(r.get(col_qty)) if col_qty else 1
-        qty = int(qty) if qty and qty > 0 else 1
-
-        # Primary path: "Your Price" is the LINE TOTAL
-        your_price_total = utils._num(r.get(col_your)) if col_your else None
-
-        unit_price = None
-        extended = 0.0
-
-        if your_price_total is not None and not np.isnan(your_price_total):
-            # Unit Price = Your Price / QTY ; Extended = Your Price
-            unit_price = (your_price_total / qty) if qty else your_price_total
-            extended = your_price_total
-        else:
-            # Fallback path (if "Your Price" missing): use list & discount or list itself
-            list_price = utils._num(r.get(col_list)) if col_list else None
-            disc = utils._num(r.get(col_disc)) if col_disc else 0
-            if list_price is not None:
-                unit_price = list_price * (1 - (disc or 0))
-                extended = unit_price * qty
-            else:
-                unit_price = 0.0
-                extended = 0.0
-
-        note_val = (str(r.get(col_note)).strip()
-                    if col_note and pd.notna(r.get(col_note)) else "")
-        category_val = (str(r.get(col_cat)).strip()
-                        if col_cat and pd.notna(r.get(col_cat)) else "")
-
-        items.append({
-            "pt_sku": "" if sku.lower() == "nan" else sku,
-            "qty": qty,
-            "description": "" if desc.lower() == "nan" else desc,
-            # Keep list_price if you want to optionally display it via --show-list-price
-            "list_price": float(utils._num(r.get(col_list))) if col_list and pd.notna(r.get(col_list)) else None,
-            # New: include explicit unit_price for the template
-            "unit_price": float(unit_price) if unit_price is not None else 0.0,
-            # Extended (subtotal) is always the line total (Your Price)
-            "subtotal": float(extended),
-            "notes": note_val,
-            "category": category_val,
-            "start_date": _fmt_date(r.get(col_start)) if col_start else "",
-            "end_date":   _fmt_date(r.get(col_end)) if col_end else "",
-        })
+    col_note = utils._pick(df, CANDIDATES_LC["notes"])
+    col_cat = utils._pick(df, CANDIDATES_LC["category"])
+
+    # Clean SKU/Description once per column: str() of a missing cell is "nan",
+    # which counts as blank just like an empty string.
+    def _text(c) -> pd.Series:
+        if not c:
+            return pd.Series("", index=df.index, dtype=object)
+        t = df[c].astype("string").str.strip()
+        return t.mask(t.isna() | t.str.lower().eq("nan"), "").astype(object)
+
+    sku_ser = _text(col_sku)
+    desc_ser = _text(col_desc)
+
+    # Drop rows with neither SKU nor Description, and "Totals" rows, before the loop
+    not_totals = df.iloc[:, 0].astype("string").str.strip().str.lower().ne("totals").fillna(True)
+    keep = (sku_ser.ne("") | desc_ser.ne("")).to_numpy(dtype=bool) & not_totals.to_numpy(dtype=bool)
+    df = df[keep]
+    sku_ser, desc_ser = sku_ser[keep], desc_ser[keep]
+
+    # Pull each picked column out once as a plain array and walk them in lockstep;
+    # iterrows would box every row into a Series.
+    n = len(df)
+
+    def _col(c):
+        # dtype=object keeps pandas scalars (Timestamp, NaT) instead of np.datetime64
+        return df[c].to_numpy(dtype=object) if c else np.full(n, None, dtype=object)
+
+    # Numeric columns are cleaned/converted column-wise, not per cell
+    def _num_col(c):
+        return utils._num_series(df[c]).to_numpy() if c else np.full(n, np.nan)
+
+    # Dates are parsed per column, not per cell
+    start_fmt = _fmt_dates(df[col_start]) if col_start else np.full(n, "", dtype=object)
+    end_fmt = _fmt_dates(df[col_end]) if col_end else np.full(n, "", dtype=object)
+
+    # Every surviving row becomes exactly one item, so build the list in one comprehension
+    items: list[QuoteItem] = [
+        _make_item(*vals) for vals in zip(
+            sku_ser.to_numpy(), desc_ser.to_numpy(), _num_col(col_qty), _num_col(col_your), _num_col(col_list),
+            _num_col(col_disc), _col(col_note), _col(col_cat), start_fmt, end_fmt,
+        )
+    ]
     return items
 
 # ------------------ HTML render ------------------
 
 
-def render_html(context: dict, template_html: str) -> str:
-    env = Environment(loader=BaseLoader())
-    return env.from_string(template_html).render(**context)
+@functools.lru_cache(maxsize=4)
+def _get_template(template_src: str):
+    # Parse/compile each template source once per process
+    env = Environment(loader=BaseLoader(), autoescape=False, auto_reload=False)
+    return env.from_string(template_src)
+
+
+def add_display_strings(items_by_category: list[dict], total: float, round_values) -> str:
+    # Formats every money value the template shows once, up front, so the render loop
+    # only substitutes strings: each group's QuoteItems become QuoteRows. Returns the
+    # formatted grand total.
+    fmt = "{:,.0f}".format if round_values == "True" else "{:,.2f}".format
+    for group in items_by_category:
+        rows = []
+        for it in group["items"]:
+            per_unit = it.subtotal / (it.qty or 1)
+            rows.append(QuoteRow(
+                *it,
+                fmt(per_unit),
+                fmt(it.list_price if it.list_price else per_unit),
+                fmt(it.unit_price if it.unit_price is not None else per_unit),
+                fmt(it.subtotal),
+            ))
+        group["items"] = rows
+        group["subtotal_str"] = fmt(group["subtotal"])
+    return fmt(total)
+
+
+def render_html(context: dict, template) -> str:
+    # Accepts a compiled jinja2 Template (e.g. QUOTE_TEMPLATE) or raw template source
+    if isinstance(template, str):
+        template = _get_template(template)
+    return template.render(**context)
 
 # ------------------ Main ------------------
 
@@ -244,6 +388,10 @@ def main():
                     help="Include the 'List Price' column when --round-values=False (Excel mode only)")
     ap.add_argument("--usa", action="store_true",
                     help='Use the US template (utils/quote_html_template_usa.py) instead of the default (Excel mode only)')
+    ap.add_argument("--pdf-async", action="store_true",
+                    help="Write the PDF from a background process and return once the HTML is written (Excel mode only)")
+    ap.add_argument("--no-pdf-cache", action="store_true",
+                    help="Always render the PDF instead of reusing a cached render (HTML mode only)")
     args = ap.parse_args()
 
     # ─────────────────────────────
@@ -257,10 +405,10 @@ def main():
         # If --out is provided in HTML mode, treat it as the PDF output path.
         # Otherwise, default to "<usehtml>.pdf" in the same directory.
         pdf_out = Path(args.out) if args.out else html_path.with_suffix(".pdf")
-        # utils.write_pdf_via_playwright() writes the PDF next to the HTML by default.
+        # utils.write_pdf() writes the PDF next to the HTML by default.
         # If it doesn't support a custom output path, we can move/rename after.
         # But first, write the PDF using the existing function:
-        utils.write_pdf_via_playwright(html_path)
+        utils.write_pdf(html_path, cache=not args.no_pdf_cache)
 
         # If a custom --out was provided and differs from default, rename
         default_pdf = html_path.with_suffix(".pdf")
@@ -282,11 +430,20 @@ def main():
     if not excel_path.exists():
         raise FileNotFoundError(excel_path)
 
+    # Launch Chromium in the background while the workbook is read and parsed.
+    # Playwright's sync API is thread-bound, so the PDF step runs on this same worker.
+    # (--pdf-async renders in a separate process and WeasyPrint needs no browser,
+    # so there is nothing to warm for either.)
+    pdf_executor = None
+    if not args.pdf_async and utils.pdf_engine() == "playwright":
+        pdf_executor = ThreadPoolExecutor(max_workers=1)
+        pdf_executor.submit(utils._warm_playwright)
+
     # Choose template lazily (so imports only happen when needed)
     if args.usa:
-        from utils.quote_html_template_usa import quoteTemplateHtml as TEMPLATE_HTML
+        from utils.quote_html_template_usa import QUOTE_TEMPLATE
     else:
-        from utils.quote_html_template import quoteTemplateHtml as TEMPLATE_HTML
+        from utils.quote_html_template import QUOTE_TEMPLATE
 
     # 1) (optional) force real Excel recalc
     if args.excel_recalc:
@@ -294,48 +451,57 @@ def main():
         if not ok:
             print("Warning: Excel recalc via xlwings failed or not available. Continuing with cached/fallback values.")
 
-    # Pick items sheet
-    xls = pd.ExcelFile(excel_path)
-    items_sheet = args.items_sheet or utils._prefer_sheet(
-        xls, ["items", "quote", "lines", "sheet1", "my customer deal"]
-    )
-
-    # 2) try cached (computed) values explicitly via openpyxl
-    df_cached = read_with_openpyxl_cached(excel_path, items_sheet)
+    # Pick items sheet and 2) try cached (computed) values explicitly via openpyxl,
+    # both from a single open of the workbook
+    wb = open_workbook_cached(excel_path)
+    try:
+        items_sheet = args.items_sheet or utils._prefer_sheet(
+            wb.sheetnames, ["items", "quote", "lines", "sheet1", "my customer deal"]
+        )
+        try:
+            df_cached = read_with_openpyxl_cached(wb, items_sheet)
+        except Exception:
+            df_cached = None
+    finally:
+        wb.close()
 
-    # 3) fall back to pandas
-    if df_cached.empty:
+    # 3) fall back to pandas only if the openpyxl read itself failed; an empty sheet
+    # would read back empty through pandas too
+    if df_cached is None:
         df_cached = read_with_pandas_values(excel_path, items_sheet)
 
+    if not args.excel_recalc and missing_cached_values(df_cached):
+        # stderr keeps stdout pure JSON; a blank "Your Price" is valid when List Price/Discount are set
+        print("Note: 'Your Price' has no cached values, so prices come from List Price/Discount. "
+              "If it holds formulas, re-save in Excel or use --excel-recalc.", file=sys.stderr)
+
     items = parse_items(df_cached)
-    bom_total = float(np.nansum([i["subtotal"]
-                      for i in items])) if items else 0.0
 
     # ---- NEW: group items by Category & compute per-category subtotals ----
     def _cat_name(v: str) -> str:
         s = (v or "").strip()
         return s if s else "Uncategorized"
 
-    # Preserve first-seen order of categories from the incoming items list
-    ordered_categories: list[str] = []
-    seen = set()
+    # One pass; dicts keep first-seen category order
+    groups: dict[str, dict] = {}
     for it in items:
-        c = _cat_name(it.get("category"))
-        if c not in seen:
-            ordered_categories.append(c)
-            seen.add(c)
-
-    groups = OrderedDict()
-    for c in ordered_categories:
-        groups[c] = {"category": c, "items": [], "subtotal": 0.0}
-
-    for it in items:
-        c = _cat_name(it.get("category"))
-        g = groups[c]
+        c = _cat_name(it.category)
+        g = groups.get(c)
+        if g is None:
+            g = groups[c] = {"category": c, "items": []}
         g["items"].append(it)
-        g["subtotal"] += float(it.get("subtotal") or 0.0)
 
     items_by_category = list(groups.values())
+
+    # Subtotals, Item # offsets and the grand total from the groups; parse_items never
+    # emits NaN subtotals, so plain compensated sums are enough. Item # runs on across
+    # categories: each group starts after the previous ones.
+    offset = 0
+    for g in items_by_category:
+        g["subtotal"] = math.fsum([it.subtotal for it in g["items"]])
+        g["offset"] = offset
+        offset += len(g["items"])
+    bom_total = math.fsum([g["subtotal"] for g in items_by_category])
     # ----------------------------------------------------------------------
 
     # Minimal header meta
@@ -363,9 +529,11 @@ def main():
     else:
         meta["add_notes"] = quote_notes
 
+    total_str = add_display_strings(items_by_category, bom_total, meta["round_values"])
+
     owner = {"name": meta["owner_name"], "email": meta["owner_email"]}
     context = {
-        "img_str": LOGO_B64,
+        "img_str": get_logo_b64(),
         "quote_number": meta["quote_number"],
         "date": meta["date"],
         "payment_terms": meta["payment_terms"],
@@ -399,17 +567,42 @@ def main():
             "duty": meta["duty"],
             "taxes": meta["taxes"],
             "total": bom_total,
+            "total_str": total_str,
         },
         "quote_notes": None,
         "add_notes": meta["add_notes"],
     }
 
     # Render HTML + write
-    html = render_html(context, TEMPLATE_HTML)
+    html = render_html(context, QUOTE_TEMPLATE)
     out_path.write_text(html, encoding="utf-8")
 
     # Create a matching PDF (same name, same directory)
-    utils.write_pdf_via_playwright(out_path)
+    if args.pdf_async:
+        # Detached worker process; we print the JSON and exit without waiting for it.
+        # It must not hold our stdin/stdout/stderr, or a caller capturing our output
+        # would still wait for the PDF; its errors go to a log instead.
+        log_path = Path(".cache/pdf_worker.log")
+        log_path.parent.mkdir(parents=True, exist_ok=True)
+        if os.name == "nt":
+            detach = {"creationflags": subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP}
+        else:
+            detach = {"start_new_session": True}
+        with open(log_path, "ab") as log:
+            subprocess.Popen(
+                [sys.executable, "-m", "utils.pdf_worker", str(out_path.resolve())],
+                stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=log, **detach,
+            )
+    elif pdf_executor is None:
+        utils.write_pdf(out_path)
+    else:
+        # With the warmed browser. If warming failed, write_pdf_via_playwright
+        # retries the launch and raises as usual.
+        try:
+            pdf_executor.submit(utils.write_pdf, out_path).result()
+        finally:
+            pdf_executor.submit(utils._close_playwright)
+            pdf_executor.shutdown(wait=True)
 
     print(json.dumps({
         "mode": "excel_to_html_pdf",
@@ -419,7 +612,8 @@ def main():
         "category_groups": len(items_by_category),  # ← helpful runtime info
         "total": round(bom_total, 2),
         "output_html": str(out_path.resolve()),
-        "output_pdf": str(out_path.with_suffix('.pdf').resolve())
+        "output_pdf": str(out_path.with_suffix('.pdf').resolve()),
+        "pdf_async": args.pdf_async,
     }, indent=2))
 
 
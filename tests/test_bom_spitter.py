@@ -0,0 +1,42 @@
+from pathlib import Path
+
+import pytest
+from openpyxl import load_workbook
+
+from bom_spitter import BOMWriter
+
+LOGO = str(Path(__file__).resolve().parent.parent / "utils" / "logo_small.jpg")
+
+ITEMS = [
+    {"qty": 2, "type": "Hardware", "sku": "NT-EDGE-1000", "pt_sku": "NT-EDGE-1000-HW-AC",
+     "description": "Edge gateway", "price": 3499.00, "term": 12, "sell_disc": 10.0, "buy_disc": 5.0},
+    {"qty": 1, "type": "Services", "sku": "PS", "pt_sku": "PS-1",
+     "description": "Install", "price": None, "term": 12, "sell_disc": 0, "buy_disc": 0},
+]
+
+
+def test_write_bom_missing_price_is_blank(tmp_path):
+    w = BOMWriter()
+    out = w.write_bom(w.build_dataframe(ITEMS), str(tmp_path / "bom.xlsx"), logo_path=LOGO)
+
+    ws = load_workbook(out)["BOM"]
+    assert ws["G2"].value == 3499.0
+    assert ws["G3"].value is None
+    assert ws["I3"].value == "=((B3*G3)*H3)"
+    assert ws["A4"].value == "Totals"
+    assert ws["B4"].fill.fgColor.rgb == ws["A4"].fill.fgColor.rgb == "FF404040"
+
+
+def test_write_bom_fast_missing_price_is_blank(tmp_path):
+    pytest.importorskip("pyexcelerate")
+
+    w = BOMWriter()
+    out = w.write_bom_fast(w.build_dataframe(ITEMS), str(tmp_path / "bom.xlsx"))
+
+    ws = load_workbook(out)["BOM"]
+    assert ws["G2"].value == 3499.0
+    assert ws["G3"].value is None
+    assert ws["A2"].value is None
+    assert ws["A4"].value == "Totals"
+    assert ws["B4"].fill.fgColor.rgb == ws["A4"].fill.fgColor.rgb == "FF404040"
+    assert ws.column_dimensions["F"].width == pytest.approx(55.7109375, abs=1e-5)
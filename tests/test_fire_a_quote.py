@@ -0,0 +1,30 @@
+from datetime import datetime
+
+import pandas as pd
+
+from fire_a_quote import parse_items
+
+
+def test_parse_items_dated_notes_column():
+    df = pd.DataFrame.from_records(
+        [("A", "d1", 1, 100, datetime(2025, 1, 5)), ("B", "d2", 1, 50, None)],
+        columns=["SKU", "Description", "Qty", "Your Price", "Notes"],
+    )
+    assert [it.notes for it in parse_items(df)] == ["2025-01-05 00:00:00", ""]
+
+
+def test_parse_items_string_dates_parsed_per_cell():
+    dates = ["13/01/2025", "01/02/2025", "05/06/2025"]
+    df = pd.DataFrame.from_records(
+        [(f"S{i}", "d", 1, 10, d) for i, d in enumerate(dates)],
+        columns=["SKU", "Description", "Qty", "Your Price", "Start Date"],
+    )
+    assert [it.start_date for it in parse_items(df)] == ["2025-01-13", "2025-01-02", "2025-05-06"]
+
+
+def test_parse_items_duplicate_normalized_headers():
+    df = pd.DataFrame.from_records(
+        [("A", "d1", 2, 100, 9), ("B", "d2", 3, 50, 9)],
+        columns=["SKU", "Description", "Qty", "Your Price", "Qty "],
+    )
+    assert [it.qty for it in parse_items(df)] == [2, 3]
@@ -1,41 +1,302 @@
 from pathlib import Path
-import argparse, base64, json, re
+import argparse, atexit, base64, functools, hashlib, json, os, re, shutil, threading
 import pandas as pd
 
-def write_pdf_via_playwright(out_html_path: Path, html: str | None = None) -> None:
-    from playwright.sync_api import sync_playwright
+# One Chromium per process, shared by every PDF; each PDF gets its own (cheap) context.
+# Playwright's sync API is bound to the thread that started it, so warming, rendering
+# and closing must all happen on one thread.
+_PW = None
+_BROWSER = None
+_PW_LOCK = threading.RLock()
+_CONTEXTS_SERVED = 0
+_MAX_CONTEXTS_PER_BROWSER = 50  # relaunch after this many to shed Chromium's memory growth
+_CHROMIUM_ARGS = ["--disable-dev-shm-usage"]
+if os.environ.get("QUOTE_CHROMIUM_NO_SANDBOX") == "1":
+    _CHROMIUM_ARGS.append("--no-sandbox")  # root-only containers where the sandbox can't start
+
+
+def _warm_playwright():
+    """
+    Starts Playwright + Chromium once and keeps them on module globals, so
+    write_pdf_via_playwright() calls skip the browser launch.
+    """
+    global _PW, _BROWSER, _CONTEXTS_SERVED
+    with _PW_LOCK:
+        if _BROWSER is None:
+            if _PW is None:
+                from playwright.sync_api import sync_playwright
+                _PW = sync_playwright().start()
+            _BROWSER = _PW.chromium.launch(args=_CHROMIUM_ARGS)
+            _CONTEXTS_SERVED = 0
+        return _BROWSER
+
+
+def _close_playwright() -> None:
+    global _PW, _BROWSER
+    with _PW_LOCK:
+        if _BROWSER is not None:
+            _BROWSER.close()
+            _BROWSER = None
+        if _PW is not None:
+            _PW.stop()
+            _PW = None
+
+
+def _close_playwright_at_exit() -> None:
+    try:
+        _close_playwright()
+    except Exception:
+        pass  # started on a thread that is gone; the driver exits with the process
+
+
+atexit.register(_close_playwright_at_exit)
+
+
+def _new_context():
+    # Fresh context on the shared browser; the browser is recycled every
+    # _MAX_CONTEXTS_PER_BROWSER contexts.
+    global _BROWSER, _CONTEXTS_SERVED
+    with _PW_LOCK:
+        if _BROWSER is not None and _CONTEXTS_SERVED >= _MAX_CONTEXTS_PER_BROWSER:
+            _BROWSER.close()
+            _BROWSER = None
+        browser = _warm_playwright()
+        _CONTEXTS_SERVED += 1
+        return browser.new_context()
+
+
+_PDF_OPTIONS = {
+    "format": "Letter",
+    "margin": {"top": "0.3in", "right": "0.3in", "bottom": "0.5in", "left": "0.3in"},
+    "print_background": True,
+}
+
+# Renders start once the DOM is parsed; the Manrope stylesheet/font fetch then gets at
+# most this long before the PDF is printed with the template's sans-serif fallback.
+_FONT_WAIT_MS = 2000
+
+
+def _render_pdf(page, out_html_path: Path, pdf_path: Path, html: str | None) -> bool:
+    """
+    Prints the page to `pdf_path`. Returns False when the load wait timed out, i.e.
+    the PDF may have been printed with fallback fonts.
+    """
+    from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+    if html is not None:
+        # Load from string. The logo is a data: URI and the fonts are absolute URLs,
+        # so nothing needs a base URL (Page.set_content doesn't take one anyway)
+        page.set_content(html, wait_until="domcontentloaded")
+    else:
+        # Fallback: load from disk
+        page.goto(out_html_path.resolve().as_uri(), wait_until="domcontentloaded")
+    complete = True
+    try:
+        page.wait_for_load_state("load", timeout=_FONT_WAIT_MS)
+    except PlaywrightTimeoutError:
+        complete = False  # slow/offline network: don't stall the PDF on the web font
+    page.pdf(path=str(pdf_path), **_PDF_OPTIONS)
+    return complete
+
+
+# Opt-in cache of rendered PDFs keyed by a hash of their HTML (+ engine and print
+# options), so re-rendering an unchanged HTML file is a file copy. Excel runs draw a new
+# quote number each time and never hit it, so they don't use it. Least recently used
+# entries go past the size cap. Renders that missed a resource (font wait timed out,
+# WeasyPrint fetch failed) are not stored, so the next run renders them again.
+_PDF_CACHE_DIR = Path(".cache/pdfs")
+_PDF_CACHE_MAX_BYTES = 500 * 1024 * 1024
+
+# src/href/url()/@import values that load from disk relative to the HTML file. Their
+# content isn't part of the key, so HTML that uses any is never cached. srcset lists
+# several URLs, so any srcset counts.
+_RELATIVE_REF = re.compile(
+    rb"""\bsrcset\s*=|"""
+    rb"""(?:\b(?:src|href)\s*=\s*["']?|url\(\s*["']?|@import\s+["'])(?!data:|https?:|#|mailto:|["')])""",
+    re.I,
+)
+
+
+def _pdf_cache_entry(html_bytes: bytes, engine: str, base_dir: Path | None = None) -> Path | None:
+    if base_dir is not None and _RELATIVE_REF.search(html_bytes):
+        return None
+    h = hashlib.blake2b(f"{engine}:{_PDF_OPTIONS!r}:{base_dir}".encode("utf-8"), digest_size=16)
+    h.update(html_bytes)
+    return _PDF_CACHE_DIR / f"{h.hexdigest()}.pdf"
+
+
+def _pdf_cache_get(entry: Path, pdf_path: Path) -> bool:
+    try:
+        shutil.copyfile(entry, pdf_path)
+        os.utime(entry)  # mtime doubles as the LRU timestamp
+        return True
+    except OSError:
+        return False
+
+
+def _pdf_cache_put(entry: Path, pdf_path: Path) -> None:
+    # Best effort: a cache that can't be written just means the next run renders again
+    try:
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        tmp = entry.with_suffix(f".{os.getpid()}.tmp")
+        shutil.copyfile(pdf_path, tmp)
+        os.replace(tmp, entry)
+
+        entries = []
+        for p in entry.parent.glob("*.pdf"):
+            st = p.stat()
+            entries.append((st.st_mtime, st.st_size, p))
+        total = sum(size for _, size, _ in entries)
+        for _, size, p in sorted(entries):
+            if total <= _PDF_CACHE_MAX_BYTES:
+                break
+            p.unlink(missing_ok=True)
+            total -= size
+    except OSError:
+        pass
+
+
+def write_pdf_via_playwright(out_html_path: Path, html: str | None = None) -> bool:
+    pdf_path = out_html_path.with_suffix(".pdf")
+    context = _new_context()
+    try:
+        return _render_pdf(context.new_page(), out_html_path, pdf_path, html)
+    finally:
+        context.close()
+
+
+# The quote is static HTML with Paged Media CSS (@page, counter(pages)), which WeasyPrint
+# renders natively without a browser. QUOTE_PDF_ENGINE=playwright forces Chromium.
+USE_WEASYPRINT = os.environ.get("QUOTE_PDF_ENGINE", "weasyprint") == "weasyprint"
+
+
+@functools.lru_cache(maxsize=1)
+def _weasyprint_html():
+    try:
+        from weasyprint import HTML
+    except (ImportError, OSError):  # not installed, or its Pango libraries are missing
+        return None
+    return HTML
+
+
+def pdf_engine() -> str:
+    """
+    "weasyprint" when it is enabled and importable, otherwise "playwright".
+    """
+    return "weasyprint" if USE_WEASYPRINT and _weasyprint_html() is not None else "playwright"
+
+
+def write_pdf_via_weasyprint(out_html_path: Path, html: str | None = None) -> bool:
+    """
+    Returns False when a stylesheet/font/image fetch failed (WeasyPrint logs it and
+    renders without it), as write_pdf_via_playwright does on a load timeout.
+    """
+    from weasyprint import default_url_fetcher
+
+    HTML = _weasyprint_html()
     pdf_path = out_html_path.with_suffix(".pdf")
-    with sync_playwright() as p:
-        browser = p.chromium.launch()
-        page = browser.new_page()
+    failed = []
+
+    def fetch(url, *args, **kwargs):
+        try:
+            return default_url_fetcher(url, *args, **kwargs)
+        except Exception:
+            failed.append(url)
+            raise
+
+    if html is not None:
+        doc = HTML(string=html, base_url=str(out_html_path.parent), url_fetcher=fetch)
+    else:
+        doc = HTML(filename=str(out_html_path), url_fetcher=fetch)
+    doc.write_pdf(str(pdf_path))
+    return not failed
+
+
+def write_pdf(out_html_path: Path, html: str | None = None, cache: bool = False) -> None:
+    """
+    Writes the PDF next to `out_html_path` (same name, .pdf) with pdf_engine().
+    With cache=True, reuses a cached render of identical HTML when there is one
+    (for callers that can render the same HTML again, like --usehtml); renders that
+    missed a resource are not stored.
+    """
+    engine = pdf_engine()
+    pdf_path = out_html_path.with_suffix(".pdf")
+    entry = None
+    if cache:
         if html is not None:
-            # Load from string; base_url makes relative paths work
-            page.set_content(html, wait_until="load", base_url=str(out_html_path.parent.resolve()))
+            entry = _pdf_cache_entry(html.encode("utf-8"), engine)
         else:
-            # Fallback: load from disk
-            page.goto(out_html_path.resolve().as_uri(), wait_until="load")
-        page.emulate_media(media="print")
-        page.pdf(
-            path=str(pdf_path),
-            format="Letter",
-            margin={"top": "0.3in", "right": "0.3in", "bottom": "0.5in", "left": "0.3in"},
-            print_background=True,
-        )
-        browser.close()
+            entry = _pdf_cache_entry(out_html_path.read_bytes(), engine, out_html_path.resolve().parent)
+    if entry is not None and _pdf_cache_get(entry, pdf_path):
+        return
+
+    if engine == "weasyprint":
+        complete = write_pdf_via_weasyprint(out_html_path, html)
+    else:
+        complete = write_pdf_via_playwright(out_html_path, html)
+    if entry is not None and complete:
+        _pdf_cache_put(entry, pdf_path)
+
+
+async def _render_one(browser, sem, out_html_path: Path, html: str, cache: bool) -> None:
+    from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+    pdf_path = out_html_path.with_suffix(".pdf")
+    entry = _pdf_cache_entry(html.encode("utf-8"), "playwright") if cache else None
+    if entry is not None and _pdf_cache_get(entry, pdf_path):
+        return
+
+    async with sem:
+        context = await browser.new_context()
+        try:
+            page = await context.new_page()
+            await page.set_content(html, wait_until="domcontentloaded")
+            complete = True
+            try:
+                await page.wait_for_load_state("load", timeout=_FONT_WAIT_MS)
+            except PlaywrightTimeoutError:
+                complete = False
+            await page.pdf(path=str(pdf_path), **_PDF_OPTIONS)
+        finally:
+            await context.close()
+    if entry is not None and complete:
+        _pdf_cache_put(entry, pdf_path)
+
+
+async def write_pdfs_batch(jobs: list[tuple[Path, str]], concurrency: int = 4,
+                           cache: bool = False) -> None:
+    """
+    Renders many (out_html_path, html) jobs to PDFs next to their HTML paths,
+    on one browser with up to `concurrency` contexts in flight at a time.
+    cache=True reuses/stores renders in the PDF cache, as in write_pdf().
+    """
+    import asyncio
+    from playwright.async_api import async_playwright
+
+    sem = asyncio.Semaphore(concurrency)
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(args=_CHROMIUM_ARGS)
+        try:
+            await asyncio.gather(*[_render_one(browser, sem, path, html, cache) for path, html in jobs])
+        finally:
+            await browser.close()
+
+
+_ILLEGAL_FN = str.maketrans({c: "_" for c in '\\/*?:"<>|'})
+_RESERVED_FN = frozenset({
+    "CON","PRN","AUX","NUL",
+    "COM1","COM2","COM3","COM4","COM5","COM6","COM7","COM8","COM9",
+    "LPT1","LPT2","LPT3","LPT4","LPT5","LPT6","LPT7","LPT8","LPT9"
+})
 
 def _safe_filename(s: str) -> str:
       """
       Make a safe filename across Windows/macOS/Linux.
       """
       s = str(s).strip()
-      s = re.sub(r'[\\/*?:"<>|]', "_", s)  # illegal chars -> underscore
+      s = s.translate(_ILLEGAL_FN)         # illegal chars -> underscore
       s = s.rstrip(" .")                   # no trailing space/dot on Windows
-      reserved = {
-          "CON","PRN","AUX","NUL",
-          "COM1","COM2","COM3","COM4","COM5","COM6","COM7","COM8","COM9",
-          "LPT1","LPT2","LPT3","LPT4","LPT5","LPT6","LPT7","LPT8","LPT9"
-      }
-      if s.upper() in reserved:
+      if s.upper() in _RESERVED_FN:
           s = f"_{s}"
       return s or "file"
 
@@ -43,17 +304,53 @@ def _safe_filename(s: str) -> str:
 def _b64_png(data: bytes) -> str: 
     return base64.b64encode(data).decode("ascii")
 
+@functools.lru_cache(maxsize=4)
+def _logo_b64(path: Path) -> str:
+    """
+    Base64 of an image file, computed once per path per process. The string is
+    also cached next to the image as "<name>.<ext>.b64" and reused while it is newer
+    than the image, so most runs skip the encode entirely.
+    """
+    cache = path.with_name(path.name + ".b64")  # full name: logo.jpg/logo.png don't share
+    if cache.exists() and cache.stat().st_mtime >= path.stat().st_mtime:
+        return cache.read_text(encoding="ascii")
+    b64 = _b64_png(path.read_bytes())
+    try:
+        # Temp file + rename so a concurrent run never reads a half-written cache
+        tmp = cache.with_name(f"{cache.name}.{os.getpid()}.tmp")
+        tmp.write_text(b64, encoding="ascii")
+        os.replace(tmp, cache)
+    except OSError:
+        pass  # read-only checkout: just skip the cache
+    return b64
+
 def _norm_cols(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
+    # Shallow copy: only the column labels change, so share the column data
+    # instead of duplicating it (and leave the caller's frame untouched)
+    df = df.copy(deep=False)
     df.columns = [str(c).strip().lower() for c in df.columns]
-    return df
+    # "Qty" and "Qty " both become "qty"; keep the first so df[c] stays a Series
+    return df.loc[:, ~df.columns.duplicated()]
+
+@functools.lru_cache(maxsize=64)
+def _names_pattern(names: tuple[str, ...]) -> re.Pattern:
+    # One alternation over every candidate; compiled once per candidate list
+    return re.compile("|".join(map(re.escape, names)))
 
 def _pick(df: pd.DataFrame, names: list[str]) -> str|None:
+    cols = list(df.columns)
+    cols_set = set(cols)
     for n in names:
-        if n in df.columns: 
+        if n in cols_set:
             return n
+    # Substring fallback: a single regex scan finds the columns containing any
+    # candidate, then the first candidate (in priority order) decides among them
+    if not names:
+        return None
+    pattern = _names_pattern(tuple(names))
+    hits = [c for c in cols if pattern.search(c)]
     for n in names:
-        for c in df.columns:
+        for c in hits:
             if n in c: 
                 return c
     return None
@@ -64,15 +361,81 @@ def _num(x):
     except Exception: 
         return None
 
-def _prefer_sheet(xls: pd.ExcelFile, candidates: list[str]) -> str:
-    lowers = [s.lower() for s in xls.sheet_names]
+_NUM_JUNK = re.compile(r"[,$]")
+
+def _num_series(s: pd.Series) -> pd.Series:
+    # Column-wise _num: strips thousands separators/dollar signs in one pass and gives
+    # NaN (not None) where a cell is blank or not a number
+    return pd.to_numeric(s.astype(str).str.replace(_NUM_JUNK, "", regex=True).str.strip(),
+                         errors="coerce").astype(float)
+
+def _prefer_sheet(sheet_names: list[str], candidates: list[str]) -> str:
+    lut: dict[str, str] = {}
+    for s in sheet_names:
+        lut.setdefault(s.lower(), s)  # first sheet wins if two differ only by case
     for want in candidates:
-        if want.lower() in lowers:
-            return xls.sheet_names[lowers.index(want.lower())]
-    return xls.sheet_names[0]
+        hit = lut.get(want.lower())
+        if hit is not None:
+            return hit
+    return sheet_names[0]
+
+
+def _fsync_dir(path: Path) -> None:
+    # Persists a rename inside `path`. Best effort: Windows can't open a directory
+    # for fsync, so there the rename's durability is left to the filesystem.
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
 
 
 QUOTE_COUNTER_PATH = Path("utils/quote_number.txt")
+_DIGITS = re.compile(r"(\d+)")
+_COUNTER_LOCK = threading.Lock()
+
+def reserve_quote_numbers(n: int, path: Path = QUOTE_COUNTER_PATH,
+                          prefix: str = "Q-") -> list[str]:
+    """
+    Reserves `n` consecutive quote numbers with a single read + write of the
+    counter file and returns them as ['Q-<number>', ...]. Starts at 1 if the
+    file is missing/empty. Raises ValueError if n < 1.
+    """
+    if n < 1:
+        raise ValueError(f"n must be at least 1, got {n}")
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    with _COUNTER_LOCK:
+        # Read current number
+        try:
+            raw = path.read_text(encoding="utf-8").strip()
+            # allow file to contain either just digits or a prefixed value like "Q-1234"
+            m = _DIGITS.search(raw) if raw else None
+            current = int(m.group(1)) if m else 1
+        except FileNotFoundError:
+            current = 1
+        except Exception:
+            # Fallback safely if the file is corrupted
+            current = 1
+
+        # Write back next value: the new contents are flushed before the rename and
+        # the directory entry after it, so a crash can't leave the counter pointing
+        # at an already-issued number
+        next_val = current + n
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            f.write(str(next_val).encode("utf-8"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)  # atomic on most OS/filesystems
+        _fsync_dir(path.parent)
+
+    return [f"{prefix}{current + i}" for i in range(n)]
 
 def pop_and_increment_quote_number(path: Path = QUOTE_COUNTER_PATH,
                                    prefix: str = "Q-") -> str:
@@ -81,24 +444,4 @@ def pop_and_increment_quote_number(path: Path = QUOTE_COUNTER_PATH,
     and writes back (number + 1) atomically so the next run gets a new number.
     Starts at 1 if the file is missing/empty.
     """
-    path.parent.mkdir(parents=True, exist_ok=True)
-
-    # Read current number
-    try:
-        raw = path.read_text(encoding="utf-8").strip()
-        # allow file to contain either just digits or a prefixed value like "Q-1234"
-        m = re.search(r"(\d+)", raw) if raw else None
-        current = int(m.group(1)) if m else 1
-    except FileNotFoundError:
-        current = 1
-    except Exception:
-        # Fallback safely if the file is corrupted
-        current = 1
-
-    # Write back next value (atomic-ish)
-    next_val = current + 1
-    tmp = path.with_suffix(".tmp")
-    tmp.write_text(str(next_val), encoding="utf-8")
-    tmp.replace(path)  # atomic on most OS/filesystems
-
-    return f"{prefix}{current}"
\ No newline at end of file
+    return reserve_quote_numbers(1, path, prefix)[0]
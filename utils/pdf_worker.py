@@ -0,0 +1,17 @@
+# pdf_worker.py
+# Background HTML -> PDF step used by `fire_a_quote.py --pdf-async`.
+# Run from the repo root:  python -m utils.pdf_worker "Generated Quotes/<name>.html"
+import sys
+from pathlib import Path
+
+from utils.fire_a_quote_utils import write_pdf
+
+
+def main(argv: list[str]) -> None:
+    if len(argv) != 1:
+        raise SystemExit("usage: python -m utils.pdf_worker <html path>")
+    write_pdf(Path(argv[0]))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
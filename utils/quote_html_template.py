@@ -1,4 +1,7 @@
 # quote_html_template.py
+import re
+
+from jinja2 import Environment, BaseLoader
 
 quoteTemplateHtml = r"""<!doctype html>
 <html>
@@ -244,7 +247,7 @@ body{ margin:0; padding:20px; font-family:Manrope,sans-serif; background:#f8f9fa
 <div class="page-container">
   <!-- Header Section -->
   <div class="header-container">
-    <img class="logo" src="data:image/png;base64,{{ img_str }}" alt="Logo">
+    <img class="logo" src="data:image/png;base64,{{ img_str }}" alt="Logo" decoding="sync" loading="eager" fetchpriority="high" width="200" height="53">
     <h4>Quotation: {{ bom["bom_name"] }}</h4>
     <h4>Spitfire Networks Inc</h4>
     <p>Attention: {{ bom["contact_name"] }}</p>
@@ -279,9 +282,6 @@ body{ margin:0; padding:20px; font-family:Manrope,sans-serif; background:#f8f9fa
   <!-- Items Section (grouped by category) -->
   <div class="items-section">
 
-    {# Global counter for continuous Item # across categories #}
-    {% set idx = namespace(i=0) %}
-
     {% for group in items_by_category %}
       <div class="cat-header">{{ group["category"] }}</div>
 
@@ -308,42 +308,41 @@ body{ margin:0; padding:20px; font-family:Manrope,sans-serif; background:#f8f9fa
         </thead>
         <tbody>
           {% for row in group["items"] %}
-          {% set idx.i = idx.i + 1 %}
           <tr>
-            <td class="col-item">{{ idx.i }}</td>
-            <td class="col-sku">{{ row["pt_sku"] }}</td>
-            <td class="col-qty">{{ row["qty"] }}</td>
-            <td class="col-start">{{ row["start_date"] }}</td>
-            <td class="col-end">{{ row["end_date"] }}</td>
-            <td class="col-desc">{{ row["description"] }}</td>
+            <td class="col-item">{{ group["offset"] + loop.index }}</td>
+            <td class="col-sku">{{ row.pt_sku }}</td>
+            <td class="col-qty">{{ row.qty }}</td>
+            <td class="col-start">{{ row.start_date }}</td>
+            <td class="col-end">{{ row.end_date }}</td>
+            <td class="col-desc">{{ row.description }}</td>
 
             {% if round_values == "True" %}
               <td class="col-price">
-                ${{ "{:,.0f}".format((row["subtotal"]|float) / (row["qty"]|float if row["qty"] else 1)) }}
+                ${{ row.price_str }}
               </td>
               <td class="col-extended">
-                ${{ "{:,.0f}".format(row["subtotal"]|float) }}
+                ${{ row.extended_str }}
               </td>
             {% else %}
               {% if show_list_price == "True" %}
                 <td class="col-price">
-                  ${{ "{:,.2f}".format((row["list_price"]|float) if row.get("list_price") else ((row["subtotal"]|float) / (row["qty"]|float if row["qty"] else 1))) }}
+                  ${{ row.list_price_str }}
                 </td>
               {% endif %}
               <td class="col-price">
-                ${{ "{:,.2f}".format((row["unit_price"]|float) if row.get("unit_price") is not none else ((row["subtotal"]|float) / (row["qty"]|float if row["qty"] else 1))) }}
+                ${{ row.unit_price_str }}
               </td>
               <td class="col-extended">
-                ${{ "{:,.2f}".format(row["subtotal"]|float) }}
+                ${{ row.extended_str }}
               </td>
             {% endif %}
           </tr>
 
-          {% if row["notes"] %}
+          {% if row.notes %}
           <tr>
             <!-- 5 columns before Description (Item, SKU, Qty, Start, End) -->
             <td colspan="5"></td>
-            <td class="col-desc" style="font-style:italic;color:#666;padding-left:20px;">{{ row["notes"] }}</td>
+            <td class="col-desc" style="font-style:italic;color:#666;padding-left:20px;">{{ row.notes }}</td>
             <td colspan="{% if round_values == 'True' %}2{% else %}{% if show_list_price == 'True' %}3{% else %}2{% endif %}{% endif %}"></td>
           </tr>
           {% endif %}
@@ -357,8 +356,7 @@ body{ margin:0; padding:20px; font-family:Manrope,sans-serif; background:#f8f9fa
         <div class="subtotal-row">
           <div class="subtotal-label">Subtotal — {{ group["category"] }}</div>
           <div class="subtotal-amount">
-            {% if round_values == "True" %}{{ "${:,.0f}".format(group["subtotal"]|float) }}
-            {% else %}{{ "${:,.2f}".format(group["subtotal"]|float) }}{% endif %}
+            ${{ group["subtotal_str"] }}
           </div>
         </div>
       </div>
@@ -370,8 +368,7 @@ body{ margin:0; padding:20px; font-family:Manrope,sans-serif; background:#f8f9fa
       <div class="total-row">
         <div class="total-label">Total</div>
         <div class="total-amount">
-          {% if round_values == "True" %}{{ "${:,.0f}".format(bom["total"]|float) }}
-          {% else %}{{ "${:,.2f}".format(bom["total"]|float) }}{% endif %}
+          ${{ bom["total_str"] }}
         </div>
       </div>
     </div>
@@ -432,3 +429,29 @@ body{ margin:0; padding:20px; font-family:Manrope,sans-serif; background:#f8f9fa
 </div>
 </body></html>
 """
+
+# Minify the <style> block once at import so Chromium parses less CSS per render.
+# Optional: without rcssmin the template is used as written.
+try:
+    import rcssmin
+except ImportError:
+    pass
+else:
+    quoteTemplateHtml = re.sub(
+        r"(<style>)(.*?)(</style>)",
+        lambda m: m.group(1) + rcssmin.cssmin(m.group(2)) + m.group(3),
+        quoteTemplateHtml, count=1, flags=re.S,
+    )
+
+# autoescape stays off: quote descriptions and notes are rendered as written, and
+# escaping would change how any containing &, < or quotes come out.
+_env = Environment(loader=BaseLoader(), autoescape=False, auto_reload=False, cache_size=-1)
+
+
+def compile_quote_template(source: str):
+    # Compiled once at import by each template module; callers render the result
+    # directly instead of re-parsing the source.
+    return _env.from_string(source)
+
+
+QUOTE_TEMPLATE = compile_quote_template(quoteTemplateHtml)